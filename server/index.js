@@ -57,6 +57,8 @@ function isTruthyEnvValue(value) {
 }
 
 const shouldLogYtMusicReplayCommand = isTruthyEnvValue(process.env.YTMUSIC_DEBUG);
+const shouldUseYtMusicDaemon = isTruthyEnvValue(process.env.YTMUSIC_DAEMON);
+const ytmusicDaemonTimeoutMs = Number(process.env.YTMUSIC_DAEMON_TIMEOUT_MS) || 120000;
 
 fs.mkdirSync(dbDir, { recursive: true });
 
@@ -177,6 +179,120 @@ function buildYtMusicReplayCommand(scriptPath, payload) {
   ].join('\n');
 }
 
+function buildYtMusicScriptError(parsed, stderrText, exitCode) {
+  const error = new Error(parsed?.error || stderrText || `ytmusic script failed with exit code ${exitCode}`);
+  error.status = Number(parsed?.status) || 500;
+  if (parsed?.code) error.code = parsed.code;
+  if (parsed?.details) error.reason = parsed.details;
+  return error;
+}
+
+let ytmusicDaemon = null;
+
+function getYtMusicDaemon() {
+  if (ytmusicDaemon) return ytmusicDaemon;
+
+  const subprocess = spawn(ytmusicPythonBin, [ytmusicLoadScriptPath, '--daemon'], {
+    env: {
+      ...process.env,
+      YTMUSIC_AUTH_FILE: ytmusicAuthFilePath
+    },
+    stdio: ['pipe', 'pipe', 'pipe']
+  });
+  const daemon = { subprocess, pending: [], stdoutBuffer: '' };
+
+  // Fails every queued action and retires this process; the next action
+  // spawns a fresh daemon.
+  const stop = (message) => {
+    if (ytmusicDaemon === daemon) ytmusicDaemon = null;
+    if (subprocess.exitCode === null && !subprocess.killed) subprocess.kill();
+    for (const request of daemon.pending.splice(0)) {
+      const error = new Error(message);
+      error.status = 500;
+      request.reject(error);
+    }
+  };
+  daemon.stop = stop;
+
+  subprocess.stdout.setEncoding('utf8');
+  subprocess.stderr.setEncoding('utf8');
+
+  // The daemon answers actions in order, one JSON document per line.
+  subprocess.stdout.on('data', (chunk) => {
+    daemon.stdoutBuffer += chunk;
+    let newlineIndex = daemon.stdoutBuffer.indexOf('\n');
+    while (newlineIndex >= 0) {
+      const line = daemon.stdoutBuffer.slice(0, newlineIndex).trim();
+      daemon.stdoutBuffer = daemon.stdoutBuffer.slice(newlineIndex + 1);
+      newlineIndex = daemon.stdoutBuffer.indexOf('\n');
+      if (!line) continue;
+
+      const request = daemon.pending.shift();
+      if (!request) continue;
+
+      let parsed = null;
+      try {
+        parsed = JSON.parse(line);
+      } catch {
+        const error = new Error('ytmusic daemon returned invalid JSON output.');
+        error.status = 500;
+        request.reject(error);
+        continue;
+      }
+
+      if (parsed?.ok !== true) {
+        request.reject(buildYtMusicScriptError(parsed, '', 1));
+        continue;
+      }
+      request.resolve(parsed);
+    }
+  });
+
+  subprocess.stderr.on('data', (chunk) => {
+    const text = chunk.trim();
+    if (text) console.error(`[ytmusic:daemon] ${text}`);
+  });
+
+  subprocess.on('error', (spawnError) => {
+    stop(`Failed to launch ${ytmusicPythonBin}: ${spawnError.message}`);
+  });
+
+  // Writing to a daemon that just died raises EPIPE here; without a listener
+  // it would crash the API server before 'close' fires.
+  subprocess.stdin.on('error', (writeError) => {
+    stop(`ytmusic daemon input failed: ${writeError.message}`);
+  });
+
+  subprocess.on('close', (exitCode) => {
+    stop(`ytmusic daemon exited with code ${exitCode}`);
+  });
+
+  ytmusicDaemon = daemon;
+  return daemon;
+}
+
+function runYtMusicDaemonAction(payload) {
+  return new Promise((resolve, reject) => {
+    const daemon = getYtMusicDaemon();
+    // Actions are answered in order by one process, so a hung call would
+    // block every later one; give up on the daemon and start over instead.
+    const timer = setTimeout(() => {
+      daemon.stop(`ytmusic daemon timed out after ${ytmusicDaemonTimeoutMs}ms`);
+    }, ytmusicDaemonTimeoutMs);
+    daemon.pending.push({
+      resolve: (value) => {
+        clearTimeout(timer);
+        resolve(value);
+      },
+      reject: (error) => {
+        clearTimeout(timer);
+        reject(error);
+      }
+    });
+    daemon.subprocess.stdin.write(`${JSON.stringify(payload || {})}\n`);
+  });
+}
+
 async function runYtMusicScript(scriptPath, payload) {
   if (!fs.existsSync(scriptPath)) {
     const error = new Error(`Required script is missing on the API server: ${scriptPath}`);
@@ -184,6 +300,10 @@ async function runYtMusicScript(scriptPath, payload) {
     throw error;
   }
 
+  if (shouldUseYtMusicDaemon && scriptPath === ytmusicLoadScriptPath) {
+    return runYtMusicDaemonAction(payload);
+  }
+
   const isMigrationScript = scriptPath === ytmusicMigrateScriptPath;
   const replayCommand = isMigrationScript ? buildYtMusicReplayCommand(scriptPath, payload) : '';
   const requestId = isMigrationScript
@@ -212,12 +332,16 @@ async function runYtMusicScript(scriptPath, payload) {
     let stdout = '';
     let stderr = '';
 
+    // Scripts write raw UTF-8; decode via the stream so multi-byte characters split across chunks stay intact.
+    subprocess.stdout.setEncoding('utf8');
+    subprocess.stderr.setEncoding('utf8');
+
     subprocess.stdout.on('data', (chunk) => {
-      stdout += chunk.toString();
+      stdout += chunk;
     });
 
     subprocess.stderr.on('data', (chunk) => {
-      stderr += chunk.toString();
+      stderr += chunk;
     });
 
     subprocess.on('error', (spawnError) => {
@@ -267,11 +391,7 @@ async function runYtMusicScript(scriptPath, payload) {
             console.error(`[ytmusic:migrate] ${requestId} payload: ${JSON.stringify(parsed)}`);
           }
         }
-        const error = new Error(parsed?.error || trimmedStderr || `ytmusic script failed with exit code ${exitCode}`);
-        error.status = Number(parsed?.status) || 500;
-        if (parsed?.code) error.code = parsed.code;
-        if (parsed?.details) error.reason = parsed.details;
-        reject(error);
+        reject(buildYtMusicScriptError(parsed, trimmedStderr, exitCode));
         return;
       }
 
@@ -2,22 +2,71 @@
 
 from __future__ import annotations
 
-import importlib
+import functools
 import json
 import os
 import sys
-import time
-from typing import Any, NoReturn, cast
+
+# Type checkers treat this as True; at runtime it keeps typing unimported,
+# which the deferred annotations never need.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, NoReturn
+
+# By default the API server spawns a fresh interpreter per action (a long-lived
+# --daemon process is opt-in), so modules only some actions need are imported
+# where they are used to keep start-up cheap.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def json_loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class FastJsonModule:
+    """Stand-in for the json module whose loads() goes through json_loads."""
+
+    loads = staticmethod(json_loads)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(json, name)
+
+
+def use_fast_response_parser(ytmusic_module: Any) -> None:
+    # ytmusicapi decodes every API response with json.loads(response.text);
+    # large get_playlist payloads parse noticeably faster through orjson.
+    if orjson is None:
+        return
+    client_module = getattr(ytmusic_module, "ytmusic", None)
+    if getattr(client_module, "json", None) is json:
+        client_module.json = FastJsonModule()
 
 
 def emit(payload: dict[str, Any], exit_code: int = 0) -> NoReturn:
-    sys.stdout.write(json.dumps(payload))
+    # Newline-terminated so daemon mode can frame one response per line.
+    sys.stdout.buffer.write(json_dumps(payload) + b"\n")
     sys.stdout.flush()
     raise SystemExit(exit_code)
 
 
 def emit_error(
-    message: str, *, code: str, status: int = 400, details: str = ""
+    message: str,
+    *,
+    code: str,
+    status: int = 400,
+    details: str | dict[str, Any] = "",
 ) -> NoReturn:
     payload: dict[str, Any] = {
         "ok": False,
@@ -31,12 +80,15 @@ def emit_error(
 
 
 def read_payload() -> dict[str, Any]:
-    raw = sys.stdin.read()
-    if not raw.strip():
+    return parse_payload(sys.stdin.buffer.read())
+
+
+def parse_payload(raw: bytes) -> dict[str, Any]:
+    if not raw or raw.isspace():
         return {}
 
     try:
-        parsed = json.loads(raw)
+        parsed = json_loads(raw)
     except json.JSONDecodeError as exc:
         emit_error(
             "Invalid ytmusic payload.",
@@ -47,42 +99,54 @@ def read_payload() -> dict[str, Any]:
 
     if not isinstance(parsed, dict):
         emit_error("Payload must be a JSON object.", code="invalid_input", status=400)
-    return cast(dict[str, Any], parsed)
+    return parsed
 
 
 def safe_str(value: Any) -> str:
-    return value.strip() if isinstance(value, str) else ""
+    return value.strip() if type(value) is str else ""
 
 
-def safe_non_negative_int(value: Any) -> int | None:
+def is_truthy(value: Any) -> bool:
     if isinstance(value, bool):
-        return None
-    if isinstance(value, int):
-        return value if value >= 0 else None
+        return value
     if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    if isinstance(value, (int, float)):
+        return bool(value)
+    return False
+
+
+def safe_non_negative_int(value: Any) -> int | None:
+    # type() rather than isinstance() so bools are rejected without a
+    # separate check; int() already ignores surrounding whitespace.
+    value_type = type(value)
+    if value_type is int:
+        parsed = value
+    elif value_type is str:
         try:
-            parsed = int(stripped)
+            parsed = int(value)
         except ValueError:
             return None
-        return parsed if parsed >= 0 else None
-    return None
+    else:
+        return None
+    return parsed if parsed >= 0 else None
 
 
 def extract_artist_text(track: dict[str, Any]) -> str:
     artists = track.get("artists")
-    if not isinstance(artists, list):
+    if not isinstance(artists, list) or not artists:
         return ""
 
-    names: list[str] = []
-    for artist in artists:
-        if isinstance(artist, dict):
-            name = safe_str(artist.get("name"))
-            if name:
-                names.append(name)
-    return ", ".join(names)
+    # Most tracks credit a single artist; skip the generator and join for them.
+    if len(artists) == 1:
+        artist = artists[0]
+        return safe_str(artist.get("name")) if isinstance(artist, dict) else ""
+
+    return ", ".join(
+        name
+        for artist in artists
+        if isinstance(artist, dict) and (name := safe_str(artist.get("name")))
+    )
 
 
 def extract_album_text(track: dict[str, Any]) -> str:
@@ -117,10 +181,19 @@ def build_song_detail(track: dict[str, Any]) -> dict[str, str] | None:
     }
 
 
+@functools.lru_cache(maxsize=1)
+def load_ytmusic_constructor() -> Any:
+    import importlib
+
+    ytmusic_module = importlib.import_module("ytmusicapi")
+    use_fast_response_parser(ytmusic_module)
+    return getattr(ytmusic_module, "YTMusic")
+
+
+@functools.lru_cache(maxsize=1)
 def with_ytmusic() -> Any:
     try:
-        ytmusic_module = importlib.import_module("ytmusicapi")
-        ytmusic_constructor = getattr(ytmusic_module, "YTMusic")
+        ytmusic_constructor = load_ytmusic_constructor()
     except Exception as exc:
         emit_error(
             "ytmusicapi is not installed. Install it with: pip install ytmusicapi",
@@ -199,21 +272,23 @@ def handle_playlist_songs(ytmusic: Any, payload: dict[str, Any]) -> dict[str, An
         )
 
     tracks = result.get("tracks") if isinstance(result, dict) else []
+    if not isinstance(tracks, list):
+        tracks = []
+    # The app reloads the listing after every move or insert, so this fresh
+    # read is what the next action should work from.
+    store_playlist_snapshot(playlist_id, tracks)
+
+    songs: list[str] = []
     song_details: list[dict[str, str]] = []
-    if isinstance(tracks, list):
-        for track in tracks:
-            if not isinstance(track, dict):
-                continue
-            detail = build_song_detail(track)
-            if detail:
-                song_details.append(detail)
-
-    songs = [
-        f"{detail['artist']} - {detail['title']}"
-        if detail.get("artist")
-        else detail["title"]
-        for detail in song_details
-    ]
+    for track in tracks:
+        if not isinstance(track, dict):
+            continue
+        detail = build_song_detail(track)
+        if not detail:
+            continue
+        song_details.append(detail)
+        artist = detail["artist"]
+        songs.append(f"{artist} - {detail['title']}" if artist else detail["title"])
 
     return {"ok": True, "songs": songs, "songDetails": song_details}
 
@@ -274,47 +349,150 @@ def normalize_playlist_song_ref(value: Any) -> dict[str, str] | None:
     return normalized
 
 
+def normalize_tracks(tracks: list[Any]) -> list[tuple[str, str]]:
+    """Return (videoId, setVideoId) per track, keeping positions aligned."""
+    return [
+        (safe_str(track.get("videoId")), safe_str(track.get("setVideoId")))
+        if isinstance(track, dict)
+        else ("", "")
+        for track in tracks
+    ]
+
+
+def index_tracks(
+    normalized_tracks: list[tuple[str, str]],
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Map setVideoId and videoId to the first track index carrying them.
+
+    Only tracks with a setVideoId are indexed, since those are the only ones
+    that can be moved or used as a move anchor.
+    """
+    set_video_id_index: dict[str, int] = {}
+    video_id_index: dict[str, int] = {}
+    for index, (video_id, set_video_id) in enumerate(normalized_tracks):
+        if not set_video_id:
+            continue
+        set_video_id_index.setdefault(set_video_id, index)
+        if video_id:
+            video_id_index.setdefault(video_id, index)
+    return set_video_id_index, video_id_index
+
+
 def locate_playlist_song_index(
-    tracks: list[Any], song_ref: dict[str, str]
+    normalized_tracks: list[tuple[str, str]],
+    song_ref: dict[str, str],
+    set_video_id_index: dict[str, int],
+    video_id_index: dict[str, int],
 ) -> tuple[int, str]:
     target_set_video_id = safe_str(song_ref.get("setVideoId"))
     if target_set_video_id:
-        for index, track in enumerate(tracks):
-            if not isinstance(track, dict):
-                continue
-            candidate_set_video_id = safe_str(track.get("setVideoId"))
-            if candidate_set_video_id == target_set_video_id:
-                return index, candidate_set_video_id
+        index = set_video_id_index.get(target_set_video_id)
+        if index is not None:
+            return index, target_set_video_id
 
     target_video_id = safe_str(song_ref.get("videoId"))
     if target_video_id:
-        for index, track in enumerate(tracks):
-            if not isinstance(track, dict):
-                continue
-            candidate_video_id = safe_str(track.get("videoId"))
-            candidate_set_video_id = safe_str(track.get("setVideoId"))
-            if candidate_video_id == target_video_id and candidate_set_video_id:
-                return index, candidate_set_video_id
+        index = video_id_index.get(target_video_id)
+        if index is not None:
+            return index, normalized_tracks[index][1]
 
     return -1, ""
 
 
+PLAYLIST_SNAPSHOT_TTL_SECONDS = 30.0
+
+# playlistId -> (fetched at, tracks, normalized tracks). Only the daemon lives
+# long enough to reuse entries; handlers that change a playlist patch or drop
+# its entry so later actions never see their own edits missing.
+playlist_snapshots: dict[str, tuple[float, list[Any], list[tuple[str, str]]]] = {}
+
+
+def load_playlist_snapshot(
+    ytmusic: Any, playlist_id: str
+) -> tuple[list[Any], list[tuple[str, str]]]:
+    import time
+
+    cached = playlist_snapshots.get(playlist_id)
+    if (
+        cached is not None
+        and time.monotonic() - cached[0] < PLAYLIST_SNAPSHOT_TTL_SECONDS
+    ):
+        return cached[1], cached[2]
+
+    snapshot = ytmusic.get_playlist(playlist_id, limit=5000)
+    tracks = snapshot.get("tracks") if isinstance(snapshot, dict) else []
+    if not isinstance(tracks, list):
+        tracks = []
+    return store_playlist_snapshot(playlist_id, tracks)
+
+
+def store_playlist_snapshot(
+    playlist_id: str, tracks: list[Any]
+) -> tuple[list[Any], list[tuple[str, str]]]:
+    import time
+
+    normalized_tracks = normalize_tracks(tracks)
+    playlist_snapshots[playlist_id] = (time.monotonic(), tracks, normalized_tracks)
+    return tracks, normalized_tracks
+
+
+def extract_added_set_video_id(add_result: Any, video_id: str) -> str:
+    """Return the setVideoId add_playlist_items assigned to video_id, if any.
+
+    Recent ytmusicapi releases unwrap each playlistEditResults entry to its
+    playlistEditVideoAddedResultData; older ones return the raw response.
+    """
+    if not isinstance(add_result, dict):
+        return ""
+    edit_results = add_result.get("playlistEditResults")
+    if not isinstance(edit_results, list):
+        return ""
+
+    for edit_result in edit_results:
+        if not isinstance(edit_result, dict):
+            continue
+        added = edit_result.get("playlistEditVideoAddedResultData", edit_result)
+        if not isinstance(added, dict):
+            continue
+        if safe_str(added.get("videoId")) == video_id:
+            set_video_id = safe_str(added.get("setVideoId"))
+            if set_video_id:
+                return set_video_id
+    return ""
+
+
+FAILED_OPERATION_STATUSES = frozenset(("failed", "error"))
+
+
 def operation_explicitly_failed(result: Any) -> bool:
     if result is False:
         return True
 
     if isinstance(result, dict):
-        status = safe_str(result.get("status")).lower()
-        if status in {"failed", "error"}:
+        status = result.get("status")
+        if type(status) is str and status.strip().lower() in FAILED_OPERATION_STATUSES:
             return True
 
-        for key in ("ok", "success"):
-            if key in result and result.get(key) is False:
-                return True
+        if result.get("ok") is False or result.get("success") is False:
+            return True
 
     return False
 
 
+@functools.lru_cache(maxsize=None)
+def remove_accepts_videos_keyword(client_type: type) -> bool:
+    """Whether this ytmusicapi release names the remove_playlist_items list videos."""
+    import inspect
+
+    try:
+        parameters = inspect.signature(client_type.remove_playlist_items).parameters
+    except (TypeError, ValueError):
+        return True
+    return "videos" in parameters or any(
+        parameter.kind is parameter.VAR_KEYWORD for parameter in parameters.values()
+    )
+
+
 def handle_remove_playlist_items(
     ytmusic: Any, payload: dict[str, Any]
 ) -> dict[str, Any]:
@@ -339,10 +517,11 @@ def handle_remove_playlist_items(
             status=400,
         )
 
+    playlist_snapshots.pop(playlist_id, None)
     try:
-        try:
+        if remove_accepts_videos_keyword(type(ytmusic)):
             result = ytmusic.remove_playlist_items(playlist_id, videos=songs)
-        except TypeError:
+        else:
             result = ytmusic.remove_playlist_items(playlist_id, songs)
     except Exception as exc:
         emit_error(
@@ -357,7 +536,7 @@ def handle_remove_playlist_items(
             "YouTube Music reported failure when deleting playlist songs.",
             code="playlist_song_delete_failed",
             status=502,
-            details=json.dumps(result),
+            details=result if isinstance(result, dict) else str(result),
         )
 
     return {"ok": True, "playlistId": playlist_id, "deletedCount": len(songs)}
@@ -368,6 +547,7 @@ def handle_delete_playlist(ytmusic: Any, payload: dict[str, Any]) -> dict[str, A
     if not playlist_id:
         emit_error("playlistId is required.", code="invalid_input", status=400)
 
+    playlist_snapshots.pop(playlist_id, None)
     try:
         result = ytmusic.delete_playlist(playlist_id)
     except Exception as exc:
@@ -383,7 +563,7 @@ def handle_delete_playlist(ytmusic: Any, payload: dict[str, Any]) -> dict[str, A
             "YouTube Music reported failure when deleting playlist.",
             code="playlist_delete_failed",
             status=502,
-            details=json.dumps(result),
+            details=result if isinstance(result, dict) else str(result),
         )
 
     return {"ok": True, "playlistId": playlist_id}
@@ -392,6 +572,9 @@ def handle_delete_playlist(ytmusic: Any, payload: dict[str, Any]) -> dict[str, A
 def handle_insert_video_at_position(
     ytmusic: Any, payload: dict[str, Any]
 ) -> dict[str, Any]:
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
     playlist_id = safe_str(payload.get("playlistId"))
     if not playlist_id:
         emit_error("playlistId is required.", code="invalid_input", status=400)
@@ -408,39 +591,36 @@ def handle_insert_video_at_position(
             status=400,
         )
 
-    try:
-        before_snapshot = ytmusic.get_playlist(playlist_id, limit=5000)
-    except Exception as exc:
-        emit_error(
-            "Failed to load playlist songs before insert.",
-            code="song_load_failed",
-            status=502,
-            details=str(exc),
-        )
+    # The before snapshot only helps tell the new track apart from existing
+    # copies, so fetch it alongside the add. If the add lands first, the new
+    # track is still found through the fallback match below.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        before_future = pool.submit(load_playlist_snapshot, ytmusic, playlist_id)
+        try:
+            add_result = ytmusic.add_playlist_items(
+                playlist_id, [video_id], duplicates=False
+            )
+        except Exception as exc:
+            emit_error(
+                "Failed to add video to YouTube Music playlist.",
+                code="playlist_song_add_failed",
+                status=502,
+                details=str(exc),
+            )
 
-    before_tracks = (
-        before_snapshot.get("tracks") if isinstance(before_snapshot, dict) else []
-    )
-    before_set_video_ids: set[str] = set()
-    if isinstance(before_tracks, list):
-        for track in before_tracks:
-            if not isinstance(track, dict):
-                continue
-            set_video_id = safe_str(track.get("setVideoId"))
-            if set_video_id:
-                before_set_video_ids.add(set_video_id)
+        try:
+            _, before_tracks = before_future.result()
+        except Exception:
+            before_tracks = []
+    playlist_snapshots.pop(playlist_id, None)
 
-    try:
-        ytmusic.add_playlist_items(playlist_id, [video_id], duplicates=False)
-    except Exception as exc:
-        emit_error(
-            "Failed to add video to YouTube Music playlist.",
-            code="playlist_song_add_failed",
-            status=502,
-            details=str(exc),
-        )
+    before_set_video_ids, _ = index_tracks(before_tracks)
+
+    # When the add response carries the new setVideoId, one reload is enough
+    # to find its position; otherwise poll until the new track shows up.
+    added_set_video_id = extract_added_set_video_id(add_result, video_id)
 
-    after_tracks: list[Any] = []
+    after_tracks: list[tuple[str, str]] = []
     inserted_set_video_id = ""
     inserted_index = -1
     fallback_set_video_id = ""
@@ -463,7 +643,11 @@ def handle_insert_video_at_position(
         candidate_tracks = (
             after_snapshot.get("tracks") if isinstance(after_snapshot, dict) else []
         )
-        after_tracks = candidate_tracks if isinstance(candidate_tracks, list) else []
+        after_tracks = (
+            normalize_tracks(candidate_tracks)
+            if isinstance(candidate_tracks, list)
+            else []
+        )
         if not after_tracks:
             if attempt < 4:
                 time.sleep(0.25)
@@ -474,24 +658,31 @@ def handle_insert_video_at_position(
         fallback_set_video_id = ""
         fallback_index = -1
 
-        for track_index in range(len(after_tracks) - 1, -1, -1):
-            track = after_tracks[track_index]
-            if not isinstance(track, dict):
-                continue
-
-            track_video_id = safe_str(track.get("videoId"))
-            if track_video_id != video_id:
-                continue
-
-            track_set_video_id = safe_str(track.get("setVideoId"))
-            if track_set_video_id and track_set_video_id not in before_set_video_ids:
-                inserted_set_video_id = track_set_video_id
-                inserted_index = track_index
+        if added_set_video_id:
+            for track_index, (_, track_set_video_id) in enumerate(after_tracks):
+                if track_set_video_id == added_set_video_id:
+                    inserted_set_video_id = added_set_video_id
+                    inserted_index = track_index
+                    break
+            if inserted_set_video_id:
                 break
 
-            if track_set_video_id and not fallback_set_video_id:
-                fallback_set_video_id = track_set_video_id
-                fallback_index = track_index
+        # Prefer the last copy that was not in the before snapshot; otherwise
+        # fall back to the last copy of the video.
+        matches = [
+            (track_index, track_set_video_id)
+            for track_index, (track_video_id, track_set_video_id) in enumerate(
+                after_tracks
+            )
+            if track_video_id == video_id and track_set_video_id
+        ]
+        new_matches = [
+            match for match in matches if match[1] not in before_set_video_ids
+        ]
+        if new_matches:
+            inserted_index, inserted_set_video_id = new_matches[-1]
+        elif matches:
+            fallback_index, fallback_set_video_id = matches[-1]
 
         if inserted_set_video_id or fallback_set_video_id:
             break
@@ -545,10 +736,7 @@ def handle_insert_video_at_position(
 
     successor_set_video_id = ""
     for candidate_index in range(successor_index, len(after_tracks)):
-        successor_track = after_tracks[candidate_index]
-        if not isinstance(successor_track, dict):
-            continue
-        candidate_set_video_id = safe_str(successor_track.get("setVideoId"))
+        candidate_set_video_id = after_tracks[candidate_index][1]
         if candidate_set_video_id and candidate_set_video_id != inserted_set_video_id:
             successor_set_video_id = candidate_set_video_id
             break
@@ -614,7 +802,7 @@ def handle_move_playlist_song(ytmusic: Any, payload: dict[str, Any]) -> dict[str
         )
 
     try:
-        snapshot = ytmusic.get_playlist(playlist_id, limit=5000)
+        tracks, normalized_tracks = load_playlist_snapshot(ytmusic, playlist_id)
     except Exception as exc:
         emit_error(
             "Failed to load playlist songs before move.",
@@ -623,8 +811,7 @@ def handle_move_playlist_song(ytmusic: Any, payload: dict[str, Any]) -> dict[str
             details=str(exc),
         )
 
-    tracks = snapshot.get("tracks") if isinstance(snapshot, dict) else []
-    if not isinstance(tracks, list) or len(tracks) < 2:
+    if len(tracks) < 2:
         return {
             "ok": True,
             "playlistId": playlist_id,
@@ -633,7 +820,10 @@ def handle_move_playlist_song(ytmusic: Any, payload: dict[str, Any]) -> dict[str
             "toIndex": 0,
         }
 
-    current_index, moved_set_video_id = locate_playlist_song_index(tracks, raw_song)
+    set_video_id_index, video_id_index = index_tracks(normalized_tracks)
+    current_index, moved_set_video_id = locate_playlist_song_index(
+        normalized_tracks, raw_song, set_video_id_index, video_id_index
+    )
     if current_index < 0 or not moved_set_video_id:
         emit_error(
             "Could not find selected song in playlist.",
@@ -656,6 +846,77 @@ def handle_move_playlist_song(ytmusic: Any, payload: dict[str, Any]) -> dict[str
         }
 
     from_index = current_index
+    if direction == "up":
+        target_index = current_index - steps
+        anchor_index = target_index
+    else:
+        target_index = current_index + steps
+        anchor_index = target_index + 1
+
+    # moveItem=(song, anchor) places the song right before its anchor, and a
+    # bare setVideoId (no successor) moves it to the end, so any distance is a
+    # single edit.
+    move_item: str | tuple[str, str] = moved_set_video_id
+    if anchor_index < len(normalized_tracks):
+        anchor_set_video_id = normalized_tracks[anchor_index][1]
+        if not anchor_set_video_id:
+            emit_error(
+                "Could not find the song's new position in playlist.",
+                code="playlist_song_move_failed",
+                status=502,
+            )
+        move_item = (moved_set_video_id, anchor_set_video_id)
+
+    if is_truthy(os.environ.get("YTMUSIC_STEPWISE_MOVES")):
+        playlist_snapshots.pop(playlist_id, None)
+        final_index = move_playlist_song_stepwise(
+            ytmusic,
+            playlist_id,
+            tracks,
+            moved_set_video_id,
+            current_index,
+            direction,
+            steps,
+        )
+        return {
+            "ok": True,
+            "playlistId": playlist_id,
+            "moved": final_index != from_index,
+            "fromIndex": from_index,
+            "toIndex": final_index,
+        }
+
+    try:
+        ytmusic.edit_playlist(playlist_id, moveItem=move_item)
+    except Exception as exc:
+        emit_error(
+            "Failed to move song in YouTube Music playlist.",
+            code="playlist_song_move_failed",
+            status=502,
+            details=str(exc),
+        )
+
+    tracks.insert(target_index, tracks.pop(current_index))
+    normalized_tracks.insert(target_index, normalized_tracks.pop(current_index))
+
+    return {
+        "ok": True,
+        "playlistId": playlist_id,
+        "moved": True,
+        "fromIndex": from_index,
+        "toIndex": target_index,
+    }
+
+
+def move_playlist_song_stepwise(
+    ytmusic: Any,
+    playlist_id: str,
+    tracks: list[Any],
+    moved_set_video_id: str,
+    current_index: int,
+    direction: str,
+    steps: int,
+) -> int:
     final_index = current_index
 
     for _ in range(steps):
@@ -716,39 +977,63 @@ def handle_move_playlist_song(ytmusic: Any, payload: dict[str, Any]) -> dict[str
             )
             final_index += 1
 
-    return {
-        "ok": True,
-        "playlistId": playlist_id,
-        "moved": final_index != from_index,
-        "fromIndex": from_index,
-        "toIndex": final_index,
-    }
+    return final_index
 
 
-def main() -> None:
-    payload = read_payload()
+ACTION_HANDLERS: dict[str, Callable[[Any, dict[str, Any]], dict[str, Any]]] = {
+    "playlists": lambda ytmusic, _payload: handle_playlists(ytmusic),
+    "playlistSongs": handle_playlist_songs,
+    "createPlaylist": handle_create_playlist,
+    "removePlaylistItems": handle_remove_playlist_items,
+    "deletePlaylist": handle_delete_playlist,
+    "insertVideoAtPosition": handle_insert_video_at_position,
+    "movePlaylistSong": handle_move_playlist_song,
+}
+
+
+def run_action(payload: dict[str, Any]) -> NoReturn:
     action = safe_str(payload.get("action")) or "status"
 
     if action == "status":
         emit(handle_status())
 
+    handler = ACTION_HANDLERS.get(action)
+    if handler is None:
+        emit_error("Unknown ytmusic action.", code="invalid_input", status=400)
+
     ytmusic = with_ytmusic()
-    if action == "playlists":
-        emit(handle_playlists(ytmusic))
-    if action == "playlistSongs":
-        emit(handle_playlist_songs(ytmusic, payload))
-    if action == "createPlaylist":
-        emit(handle_create_playlist(ytmusic, payload))
-    if action == "removePlaylistItems":
-        emit(handle_remove_playlist_items(ytmusic, payload))
-    if action == "deletePlaylist":
-        emit(handle_delete_playlist(ytmusic, payload))
-    if action == "insertVideoAtPosition":
-        emit(handle_insert_video_at_position(ytmusic, payload))
-    if action == "movePlaylistSong":
-        emit(handle_move_playlist_song(ytmusic, payload))
-
-    emit_error("Unknown ytmusic action.", code="invalid_input", status=400)
+    emit(handler(ytmusic, payload))
+
+
+def serve() -> None:
+    """Answer newline-delimited JSON actions from stdin until it closes.
+
+    The YTMusic client, and with it the HTTP session and its pooled
+    connections, is built on first use and shared by every later action.
+    """
+    for line in sys.stdin.buffer:
+        if line.isspace():
+            continue
+        try:
+            try:
+                run_action(parse_payload(line))
+            except Exception as exc:
+                emit_error(
+                    "Unexpected ytmusic failure.",
+                    code="internal_error",
+                    status=500,
+                    details=str(exc),
+                )
+        except SystemExit:
+            continue
+
+
+def main() -> None:
+    if "--daemon" in sys.argv[1:]:
+        serve()
+        return
+
+    run_action(read_payload())
 
 
 if __name__ == "__main__":
@@ -2,17 +2,45 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import importlib
 import os
 import re
+import shelve
 import sys
+import threading
 import time
-from typing import Any, NoReturn, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, NoReturn, cast
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+
+
+def json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def json_loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def emit(payload: dict[str, Any], exit_code: int = 0) -> NoReturn:
-    sys.stdout.write(json.dumps(payload))
+    # Write the encoded bytes directly; debug output can still be sizeable.
+    sys.stdout.buffer.write(json_dumps(payload))
     sys.stdout.flush()
     raise SystemExit(exit_code)
 
@@ -32,12 +60,12 @@ def emit_error(
 
 
 def read_payload() -> dict[str, Any]:
-    raw = sys.stdin.read()
-    if not raw.strip():
+    raw = sys.stdin.buffer.read()
+    if not raw or raw.isspace():
         emit_error("Missing migration payload.", code="invalid_input", status=400)
 
     try:
-        parsed = json.loads(raw)
+        parsed = json_loads(raw)
     except json.JSONDecodeError as exc:
         emit_error(
             "Invalid migration payload.",
@@ -51,13 +79,18 @@ def read_payload() -> dict[str, Any]:
     return cast(dict[str, Any], parsed)
 
 
+NON_ALPHANUMERIC_RUN = re.compile(r"[^a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=8192)
 def normalize(value: str) -> str:
-    cleaned = re.sub(r"[^a-z0-9]+", " ", value.lower())
-    return " ".join(cleaned.split())
+    # Each run of other characters collapses to one space, so only the ends
+    # can still carry whitespace.
+    return NON_ALPHANUMERIC_RUN.sub(" ", value.lower()).strip()
 
 
 def safe_str(value: Any) -> str:
-    return value.strip() if isinstance(value, str) else ""
+    return value.strip() if type(value) is str else ""
 
 
 def is_truthy(value: Any) -> bool:
@@ -71,20 +104,19 @@ def is_truthy(value: Any) -> bool:
 
 
 def safe_non_negative_int(value: Any) -> int | None:
-    if isinstance(value, bool):
-        return None
-    if isinstance(value, int):
-        return value if value >= 0 else None
-    if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
+    # type() rather than isinstance() so bools are rejected without a
+    # separate check; int() already ignores surrounding whitespace.
+    value_type = type(value)
+    if value_type is int:
+        parsed = value
+    elif value_type is str:
         try:
-            parsed = int(stripped)
+            parsed = int(value)
         except ValueError:
             return None
-        return parsed if parsed >= 0 else None
-    return None
+    else:
+        return None
+    return parsed if parsed >= 0 else None
 
 
 def extract_artist_text(search_result: dict[str, Any]) -> str:
@@ -107,66 +139,46 @@ def extract_artist_text(search_result: dict[str, Any]) -> str:
     return fallback
 
 
-def score_search_result(
-    search_result: dict[str, Any], target_title: str, target_artist: str
-) -> int:
-    score = 0
-    result_title = normalize(safe_str(search_result.get("title")))
-    result_artists = normalize(extract_artist_text(search_result))
-    title = normalize(target_title)
-    artist = normalize(target_artist)
+def extract_album_text(search_result: dict[str, Any]) -> str:
+    album = search_result.get("album")
+    if isinstance(album, dict):
+        return safe_str(album.get("name"))
+    if isinstance(album, str):
+        return safe_str(album)
+    return ""
 
-    if title and result_title == title:
-        score += 8
-    elif title and title in result_title:
-        score += 5
-
-    if artist and result_artists == artist:
-        score += 5
-    elif artist and artist in result_artists:
-        score += 3
-    elif artist and any(
-        token and token in result_artists for token in artist.split(" ")
-    ):
-        score += 1
 
-    if safe_str(search_result.get("videoId")):
-        score += 2
+# The scoring helpers below compare already normalized strings: the target
+# fields come from the song, the result fields from one search candidate.
 
-    return score
 
+def title_match_score(result_title: str, title: str) -> int:
+    if title and result_title == title:
+        return 8
+    if title and title in result_title:
+        return 5
+    return 0
 
-def artist_match_level(search_result: dict[str, Any], target_artist: str) -> int:
-    artist = normalize(target_artist)
-    if not artist:
-        return 0
 
-    result_artists = normalize(extract_artist_text(search_result))
-    if not result_artists:
+def artist_match_level(
+    result_artists: str, artist: str, artist_tokens: tuple[str, ...]
+) -> int:
+    # artist_tokens is artist.split(" ") without empty tokens, split once by
+    # the caller rather than once per candidate.
+    if not artist or not result_artists:
         return 0
 
     if result_artists == artist:
         return 3
     if artist in result_artists:
         return 2
-    if any(token and token in result_artists for token in artist.split(" ")):
+    if any(token in result_artists for token in artist_tokens):
         return 1
     return 0
 
 
-def album_match_level(search_result: dict[str, Any], target_album: str) -> int:
-    album = normalize(target_album)
-    if not album:
-        return 0
-
-    search_album = search_result.get("album")
-    result_album = ""
-    if isinstance(search_album, dict):
-        result_album = normalize(safe_str(search_album.get("name")))
-    elif isinstance(search_album, str):
-        result_album = normalize(search_album)
-
-    if not result_album:
+def album_match_level(result_album: str, album: str) -> int:
+    if not album or not result_album:
         return 0
     if result_album == album:
         return 2
@@ -175,13 +187,22 @@ def album_match_level(search_result: dict[str, Any], target_album: str) -> int:
     return 0
 
 
+# Points for an artist match level of 0 (none) through 3 (exact).
+ARTIST_MATCH_SCORES = (0, 1, 3, 5)
+# Candidates are only considered when they carry a videoId.
+VIDEO_ID_SCORE = 2
+# album_match_level() tops out at 2 and is weighted by 4.
+MAX_ALBUM_SCORE = 8
+
+
 def pick_best_match(
     results: list[Any],
     title: str,
     artist: str,
     album: str = "",
     require_artist_match: bool = True,
-) -> dict[str, Any] | None:
+) -> tuple[dict[str, Any], str] | None:
+    # Returns the winning result together with its artist text.
     valid_results = [
         result
         for result in results
@@ -191,117 +212,308 @@ def pick_best_match(
     if not valid_results:
         return None
 
+    # The targets are the same for every candidate; normalize them once.
+    normalized_title = normalize(title)
+    normalized_artist = normalize(artist)
+    normalized_album = normalize(album)
+    artist_tokens = tuple(token for token in normalized_artist.split(" ") if token)
+
+    # Extract and normalize each candidate's fields once:
+    # (result, title, artist text, artist level, album).
+    candidates = [
+        (
+            result,
+            normalize(safe_str(result.get("title"))),
+            (artist_text := extract_artist_text(result)),
+            artist_match_level(
+                normalize(artist_text), normalized_artist, artist_tokens
+            ),
+            normalize(extract_album_text(result)),
+        )
+        for result in valid_results
+    ]
+
     if artist:
-        artist_filtered = [
-            result for result in valid_results if artist_match_level(result, artist) > 0
-        ]
+        artist_filtered = [candidate for candidate in candidates if candidate[3] > 0]
         if artist_filtered:
-            valid_results = artist_filtered
+            candidates = artist_filtered
         elif require_artist_match:
             return None
 
-    def total_score(item: dict[str, Any]) -> int:
-        return score_search_result(item, title, artist) + (
-            album_match_level(item, album) * 4
-        )
+    # Bucket candidates by title score and score the buckets best-first. A
+    # lower bucket is skipped once even its best possible total falls short of
+    # the current winner; ties still go to the earliest result.
+    buckets: dict[int, list[int]] = {}
+    for position, candidate in enumerate(candidates):
+        buckets.setdefault(
+            title_match_score(candidate[1], normalized_title), []
+        ).append(position)
+
+    max_bonus = ARTIST_MATCH_SCORES[-1] + VIDEO_ID_SCORE + MAX_ALBUM_SCORE
+    best_score = -1
+    tied_positions: list[int] = []
+    for title_score in sorted(buckets, reverse=True):
+        if title_score + max_bonus < best_score:
+            break
+        for position in buckets[title_score]:
+            _, _, _, artist_level, result_album = candidates[position]
+            score = (
+                title_score
+                + ARTIST_MATCH_SCORES[artist_level]
+                + VIDEO_ID_SCORE
+                + album_match_level(result_album, normalized_album) * 4
+            )
+            if score > best_score:
+                best_score = score
+                tied_positions = [position]
+            elif score == best_score:
+                tied_positions.append(position)
+
+    tied_positions.sort()
+    if process is None or len(tied_positions) < 2:
+        return candidates[tied_positions[0]][0], candidates[tied_positions[0]][2]
+
+    # Break ties by overall fuzzy similarity in a single rapidfuzz call;
+    # extractOne keeps the earliest choice among equal similarities.
+    _, _, best_position = process.extractOne(
+        f"{normalized_title} {normalized_artist} {normalized_album}",
+        {
+            position: f"{candidates[position][1]} "
+            f"{normalize(candidates[position][2])} "
+            f"{candidates[position][4]}"
+            for position in tied_positions
+        },
+        scorer=fuzz.WRatio,
+    )
+    return candidates[best_position][0], candidates[best_position][2]
 
-    return max(valid_results, key=total_score)
 
+def is_exact_match(result: dict[str, Any], title: str, artist: str, album: str) -> bool:
+    normalized_title = normalize(title)
+    if not normalized_title:
+        return False
+    if normalize(safe_str(result.get("title"))) != normalized_title:
+        return False
+    # Equivalent to an artist match level of 3 (exact).
+    if artist:
+        normalized_artist = normalize(artist)
+        if (
+            not normalized_artist
+            or normalize(extract_artist_text(result)) != normalized_artist
+        ):
+            return False
+    if album and normalize(extract_album_text(result)) != normalize(album):
+        return False
+    return True
+
+
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+class CachedSearch:
+    # Wraps a YTMusic client's search() with an in-memory cache and, when a
+    # path is given, a shelve store that survives between runs. Stored entries
+    # are JSON with their write time and expire after SEARCH_CACHE_TTL_SECONDS.
+    def __init__(self, ytmusic: Any, cache_path: str = "") -> None:
+        self.ytmusic = ytmusic
+        self.memory: dict[str, list[Any]] = {}
+        self.lock = threading.Lock()
+        self.store: shelve.Shelf[str] | None = None
+        if cache_path:
+            try:
+                self.store = shelve.open(cache_path)
+            except Exception:
+                self.store = None
+
+    def search(self, query: str, filter: str, limit: int = 20) -> Any:
+        # Keyed on the query itself; normalize() would drop non-Latin text and
+        # let unrelated searches share an entry.
+        key = f"{filter}:{limit}:{query.casefold()}"
+
+        with self.lock:
+            if key in self.memory:
+                return self.memory[key]
+            if self.store is not None:
+                # Missing, malformed, legacy and expired entries all count as
+                # misses and are overwritten by the fresh response.
+                try:
+                    cached = json_loads(self.store[key])
+                    fresh = (
+                        isinstance(cached["results"], list)
+                        and time.time() - cached["storedAt"] < SEARCH_CACHE_TTL_SECONDS
+                    )
+                except Exception:
+                    fresh = False
+                if fresh:
+                    self.memory[key] = cached["results"]
+                    return self.memory[key]
+
+        results = self.ytmusic.search(query, filter=filter, limit=limit)
+        # Only well-formed responses are cached; errors propagate uncached.
+        if isinstance(results, list):
+            with self.lock:
+                self.memory[key] = results
+                # An empty response may be a transient throttle or a release
+                # that is not indexed yet; keep it out of the persistent store.
+                if self.store is not None and results:
+                    try:
+                        self.store[key] = json_dumps(
+                            {"storedAt": time.time(), "results": results}
+                        )
+                    except Exception:
+                        pass
+        return results
 
-def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
-    try:
-        ytmusic_module = importlib.import_module("ytmusicapi")
-        ytmusic_constructor = getattr(ytmusic_module, "YTMusic")
-    except Exception as exc:
-        emit_error(
-            "ytmusicapi is not installed. Install it with: pip install ytmusicapi",
-            code="missing_dependency",
-            status=500,
-            details=str(exc),
-        )
+    def close(self) -> None:
+        with self.lock:
+            if self.store is not None:
+                self.store.close()
+                self.store = None
 
-    auth_file = os.environ.get("YTMUSIC_AUTH_FILE", "").strip()
-    if not auth_file:
-        emit_error(
-            "YTMUSIC_AUTH_FILE is not configured.", code="missing_auth_file", status=500
-        )
 
-    if not os.path.exists(auth_file):
-        emit_error(
-            f"Auth file does not exist: {auth_file}",
-            code="missing_auth_file",
-            status=400,
-        )
+SEARCH_WORKERS = 8
+# Result fields kept in debug output; the rest (thumbnails, feedback tokens,
+# ...) only bloats the payload.
+DEBUG_RESULT_KEYS = ("videoId", "title", "artists", "album", "duration")
 
-    playlist_id = safe_str(payload.get("playlistId"))
-    if not playlist_id:
-        emit_error("playlistId is required.", code="invalid_input", status=400)
 
-    songs = payload.get("songs")
-    if not isinstance(songs, list) or not songs:
-        emit_error("songs must be a non-empty array.", code="invalid_input", status=400)
-    normalized_songs = cast(list[Any], songs)
+def summarize_results(results: list[Any]) -> list[dict[str, Any]]:
+    return [
+        {key: result[key] for key in DEBUG_RESULT_KEYS if key in result}
+        for result in results
+    ]
 
-    try:
-        ytmusic = ytmusic_constructor(auth_file)
-    except Exception as exc:
-        emit_error(
-            "Failed to initialize ytmusicapi. Check your auth file.",
-            code="auth_init_failed",
-            status=400,
-            details=str(exc),
+
+def search_variants(
+    ytmusic: Any,
+    queries: list[str],
+    search_filter: str,
+    query_executor: ThreadPoolExecutor,
+) -> Iterator[Any]:
+    # Issue every query variant up front, then yield responses in query order.
+    futures = [
+        query_executor.submit(ytmusic.search, query, filter=search_filter, limit=20)
+        for query in queries
+    ]
+    for future in futures:
+        yield future.result()
+
+
+def search_song(
+    ytmusic: Any,
+    index: int,
+    song: Any,
+    debug_enabled: bool,
+    query_executor: ThreadPoolExecutor,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None, list[dict[str, Any]]]:
+    # Returns (pending migration, failure, debug entries) for a single song.
+    song_debug: list[dict[str, Any]] = []
+
+    if not isinstance(song, dict):
+        return (
+            None,
+            {
+                "songKey": f"song-{index}",
+                "error": "Song payload must be an object.",
+            },
+            song_debug,
         )
 
-    debug_enabled = is_truthy(payload.get("debug")) or is_truthy(
-        os.environ.get("YTMUSIC_DEBUG")
-    )
-    preserve_position = is_truthy(payload.get("preservePosition"))
+    song_key = safe_str(song.get("songKey")) or f"song-{index}"
+    title = safe_str(song.get("title"))
+    artist = safe_str(song.get("artist"))
+    album = safe_str(song.get("album"))
 
-    pending_migrations: list[dict[str, Any]] = []
-    failed: list[dict[str, Any]] = []
-    debug_searches: list[dict[str, Any]] = []
+    if not title:
+        return (
+            None,
+            {
+                "songKey": song_key,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "error": "Song title is required.",
+            },
+            song_debug,
+        )
 
-    for index, song in enumerate(normalized_songs):
-        if not isinstance(song, dict):
-            failed.append(
-                {
-                    "songKey": f"song-{index}",
-                    "error": "Song payload must be an object.",
-                }
-            )
-            continue
+    query = f"{artist} {title}".strip()
+
+    queries = [query]
+    if album:
+        queries.append(f"{artist} {title} {album}".strip())
 
-        song_key = safe_str(song.get("songKey")) or f"song-{index}"
-        title = safe_str(song.get("title"))
-        artist = safe_str(song.get("artist"))
-        album = safe_str(song.get("album"))
+    merged_results: list[Any] = []
+    seen_video_ids: set[str] = set()
 
-        if not title:
-            failed.append(
+    try:
+        for query_index, query_variant in enumerate(queries):
+            # A candidate matching every given field already has the highest
+            # possible score, so later variants could not displace it.
+            if query_index and any(
+                is_exact_match(result, title, artist, album)
+                for result in merged_results
+            ):
+                break
+
+            variant_results = ytmusic.search(query_variant, filter="songs", limit=20)
+            if not isinstance(variant_results, list):
+                continue
+
+            for result in variant_results:
+                if not isinstance(result, dict):
+                    continue
+                video_id = safe_str(result.get("videoId"))
+                if not video_id or video_id in seen_video_ids:
+                    continue
+                seen_video_ids.add(video_id)
+                merged_results.append(result)
+    except Exception as exc:
+        if debug_enabled:
+            song_debug.append(
                 {
                     "songKey": song_key,
                     "title": title,
                     "artist": artist,
                     "album": album,
-                    "error": "Song title is required.",
+                    "query": query,
+                    "queries": queries,
+                    "error": str(exc),
                 }
             )
-            continue
-
-        query = f"{artist} {title}".strip()
-
-        queries = [query]
-        if album:
-            queries.append(f"{artist} {title} {album}".strip())
+        return (
+            None,
+            {
+                "songKey": song_key,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "error": f"Search failed: {exc}",
+            },
+            song_debug,
+        )
 
-        merged_results: list[Any] = []
-        seen_video_ids: set[str] = set()
+    if debug_enabled:
+        song_debug.append(
+            {
+                "songKey": song_key,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "query": query,
+                "queries": queries,
+                "response": summarize_results(merged_results),
+            }
+        )
 
+    match = pick_best_match(merged_results, title, artist, album)
+    if not match:
+        video_results: list[Any] = []
+        seen_video_ids = set()
         try:
-            for query_variant in queries:
-                variant_results = ytmusic.search(
-                    query_variant, filter="songs", limit=20
-                )
+            for variant_results in search_variants(
+                ytmusic, queries, "videos", query_executor
+            ):
                 if not isinstance(variant_results, list):
                     continue
 
@@ -312,10 +524,10 @@ def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
                     if not video_id or video_id in seen_video_ids:
                         continue
                     seen_video_ids.add(video_id)
-                    merged_results.append(result)
+                    video_results.append(result)
         except Exception as exc:
             if debug_enabled:
-                debug_searches.append(
+                song_debug.append(
                     {
                         "songKey": song_key,
                         "title": title,
@@ -323,22 +535,12 @@ def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
                         "album": album,
                         "query": query,
                         "queries": queries,
-                        "error": str(exc),
+                        "videoFallbackError": str(exc),
                     }
                 )
-            failed.append(
-                {
-                    "songKey": song_key,
-                    "title": title,
-                    "artist": artist,
-                    "album": album,
-                    "error": f"Search failed: {exc}",
-                }
-            )
-            continue
 
         if debug_enabled:
-            debug_searches.append(
+            song_debug.append(
                 {
                     "songKey": song_key,
                     "title": title,
@@ -346,103 +548,349 @@ def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
                     "album": album,
                     "query": query,
                     "queries": queries,
-                    "response": merged_results,
+                    "videoFallbackResponse": summarize_results(video_results),
                 }
             )
 
-        best_match = pick_best_match(merged_results, title, artist, album)
-        if not best_match:
-            video_results: list[Any] = []
-            seen_video_ids = set()
-            try:
-                for query_variant in queries:
-                    variant_results = ytmusic.search(
-                        query_variant, filter="videos", limit=20
-                    )
-                    if not isinstance(variant_results, list):
-                        continue
+        match = pick_best_match(
+            video_results,
+            title,
+            artist,
+            album,
+            require_artist_match=False,
+        )
 
-                    for result in variant_results:
-                        if not isinstance(result, dict):
-                            continue
-                        video_id = safe_str(result.get("videoId"))
-                        if not video_id or video_id in seen_video_ids:
-                            continue
-                        seen_video_ids.add(video_id)
-                        video_results.append(result)
-            except Exception as exc:
-                if debug_enabled:
-                    debug_searches.append(
-                        {
-                            "songKey": song_key,
-                            "title": title,
-                            "artist": artist,
-                            "album": album,
-                            "query": query,
-                            "queries": queries,
-                            "videoFallbackError": str(exc),
-                        }
-                    )
+    if not match:
+        return (
+            None,
+            {
+                "songKey": song_key,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "error": "No matching song found on YouTube Music.",
+            },
+            song_debug,
+        )
 
-            if debug_enabled:
-                debug_searches.append(
-                    {
-                        "songKey": song_key,
-                        "title": title,
-                        "artist": artist,
-                        "album": album,
-                        "query": query,
-                        "queries": queries,
-                        "videoFallbackResponse": video_results,
-                    }
-                )
+    best_match, matched_artists = match
+    video_id = safe_str(best_match.get("videoId"))
+    if not video_id:
+        return (
+            None,
+            {
+                "songKey": song_key,
+                "title": title,
+                "artist": artist,
+                "album": album,
+                "error": "Search result did not include a videoId.",
+            },
+            song_debug,
+        )
 
-            best_match = pick_best_match(
-                video_results,
-                title,
-                artist,
-                album,
-                require_artist_match=False,
-            )
+    return (
+        {
+            "songKey": song_key,
+            "title": title,
+            "artist": artist,
+            "album": album,
+            "expectedIndex": safe_non_negative_int(song.get("expectedIndex")),
+            "videoId": video_id,
+            "matchedTitle": safe_str(best_match.get("title")),
+            "matchedArtists": matched_artists,
+        },
+        None,
+        song_debug,
+    )
 
-        if not best_match:
-            failed.append(
-                {
-                    "songKey": song_key,
-                    "title": title,
-                    "artist": artist,
-                    "album": album,
-                    "error": "No matching song found on YouTube Music.",
-                }
-            )
+
+def song_match_key(song: Any) -> tuple[str, str, str] | None:
+    # None for songs search_song() rejects before searching. Not normalize():
+    # it drops non-Latin text, so distinct titles would share a key.
+    if not isinstance(song, dict):
+        return None
+    title = safe_str(song.get("title"))
+    if not title:
+        return None
+    return (
+        title.casefold(),
+        safe_str(song.get("artist")).casefold(),
+        safe_str(song.get("album")).casefold(),
+    )
+
+
+def reuse_outcome(
+    outcome: tuple[dict[str, Any] | None, dict[str, Any] | None, list[dict[str, Any]]],
+    index: int,
+    song: dict[str, Any],
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None, list[dict[str, Any]]]:
+    # Re-labels another song's search_song() outcome with this song's own
+    # identity and expectedIndex.
+    pending, failure, song_debug = outcome
+    identity = {
+        "songKey": safe_str(song.get("songKey")) or f"song-{index}",
+        "title": safe_str(song.get("title")),
+        "artist": safe_str(song.get("artist")),
+        "album": safe_str(song.get("album")),
+    }
+    if pending is not None:
+        pending = {
+            **pending,
+            **identity,
+            "expectedIndex": safe_non_negative_int(song.get("expectedIndex")),
+        }
+    if failure is not None:
+        failure = {**failure, **identity}
+    return pending, failure, [{**entry, **identity} for entry in song_debug]
+
+
+def add_succeeded(response: Any) -> bool:
+    # ytmusicapi does not raise when YouTube rejects an add (for example a
+    # duplicate with duplicates=False); it returns the raw response instead.
+    return isinstance(response, dict) and "SUCCEEDED" in safe_str(
+        response.get("status")
+    )
+
+
+def collect_set_video_ids(tracks: Any) -> set[str]:
+    if not isinstance(tracks, list):
+        return set()
+    return {
+        set_video_id
+        for track in tracks
+        if type(track) is dict and (set_video_id := safe_str(track.get("setVideoId")))
+    }
+
+
+def fetch_playlist_tracks(
+    ytmusic: Any,
+    playlist_id: str,
+    added_video_ids: set[str],
+    before_set_video_ids: set[str],
+) -> list[Any]:
+    # Freshly added items can take a moment to show up; keep re-reading until
+    # every added video has a new item, then settle for the last listing.
+    tracks: list[Any] = []
+    for attempt in range(5):
+        snapshot = ytmusic.get_playlist(playlist_id, limit=5000)
+        candidate_tracks = snapshot.get("tracks") if isinstance(snapshot, dict) else []
+        if isinstance(candidate_tracks, list) and candidate_tracks:
+            tracks = candidate_tracks
+            new_video_ids = {
+                safe_str(track.get("videoId"))
+                for track in tracks
+                if isinstance(track, dict)
+                and (set_video_id := safe_str(track.get("setVideoId")))
+                and set_video_id not in before_set_video_ids
+            }
+            if added_video_ids <= new_video_ids:
+                return tracks
+        if attempt < 4:
+            time.sleep(0.25)
+    return tracks
+
+
+def reposition_songs(
+    ytmusic: Any,
+    playlist_id: str,
+    songs: list[dict[str, Any]],
+    added_video_ids: set[str],
+    before_set_video_ids: set[str],
+) -> None:
+    if all(song.get("expectedIndex") is None for song in songs):
+        return
+
+    after_tracks = fetch_playlist_tracks(
+        ytmusic, playlist_id, added_video_ids, before_set_video_ids
+    )
+    if not after_tracks:
+        return
+
+    # Local copy of the playlist order, kept in sync with every move below.
+    order = [
+        safe_str(track.get("setVideoId")) if isinstance(track, dict) else ""
+        for track in after_tracks
+    ]
+
+    # Newly inserted copies per videoId in playlist order.
+    video_ids: dict[str, str] = {}
+    inserted: dict[str, list[str]] = {}
+    for track in after_tracks:
+        if not isinstance(track, dict):
+            continue
+        set_video_id = safe_str(track.get("setVideoId"))
+        if not set_video_id:
+            continue
+        video_id = safe_str(track.get("videoId"))
+        video_ids[set_video_id] = video_id
+        if set_video_id not in before_set_video_ids:
+            inserted.setdefault(video_id, []).append(set_video_id)
+
+    assigned: list[tuple[dict[str, Any], str]] = []
+    for song in songs:
+        candidates = inserted.get(song["videoId"])
+        assigned.append((song, candidates.pop(0) if candidates else ""))
+
+    # Replay the songs in input order as if each had been added on its own:
+    # new items of songs not reached yet stay hidden, so neither the target
+    # bound nor the successor search counts the unplaced tail.
+    hidden = {
+        set_video_id
+        for _, set_video_id in assigned
+        if set_video_id and set_video_id not in before_set_video_ids
+    }
+    for song, set_video_id in assigned:
+        hidden.discard(set_video_id)
+        expected_index = song.get("expectedIndex")
+        if expected_index is None:
             continue
 
-        video_id = safe_str(best_match.get("videoId"))
-        if not video_id:
-            failed.append(
-                {
-                    "songKey": song_key,
-                    "title": title,
-                    "artist": artist,
-                    "album": album,
-                    "error": "Search result did not include a videoId.",
-                }
+        try:
+            visible = [candidate for candidate in order if candidate not in hidden]
+            if not set_video_id:
+                # The add was rejected as a duplicate, so move the latest copy
+                # already in the playlist instead.
+                set_video_id = next(
+                    (
+                        candidate
+                        for candidate in reversed(visible)
+                        if video_ids.get(candidate) == song["videoId"]
+                    ),
+                    "",
+                )
+                if not set_video_id:
+                    continue
+            inserted_index = visible.index(set_video_id)
+            bounded_expected_index = min(expected_index, len(visible) - 1)
+            if inserted_index == bounded_expected_index:
+                continue
+
+            successor_index = bounded_expected_index
+            if inserted_index < bounded_expected_index:
+                successor_index = bounded_expected_index + 1
+
+            while successor_index < len(visible) and (
+                not visible[successor_index] or visible[successor_index] == set_video_id
+            ):
+                successor_index += 1
+            if successor_index >= len(visible):
+                continue
+
+            successor_set_video_id = visible[successor_index]
+            ytmusic.edit_playlist(
+                playlist_id,
+                moveItem=(set_video_id, successor_set_video_id),
             )
+            order.remove(set_video_id)
+            order.insert(order.index(successor_set_video_id), set_video_id)
+        except Exception:
             continue
 
-        pending_migrations.append(
-            {
-                "songKey": song_key,
-                "title": title,
-                "artist": artist,
-                "album": album,
-                "expectedIndex": safe_non_negative_int(song.get("expectedIndex")),
-                "videoId": video_id,
-                "matchedTitle": safe_str(best_match.get("title")),
-                "matchedArtists": extract_artist_text(best_match),
-            }
+
+def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
+    try:
+        ytmusic_module = importlib.import_module("ytmusicapi")
+        ytmusic_constructor = getattr(ytmusic_module, "YTMusic")
+    except Exception as exc:
+        emit_error(
+            "ytmusicapi is not installed. Install it with: pip install ytmusicapi",
+            code="missing_dependency",
+            status=500,
+            details=str(exc),
+        )
+
+    auth_file = os.environ.get("YTMUSIC_AUTH_FILE", "").strip()
+    if not auth_file:
+        emit_error(
+            "YTMUSIC_AUTH_FILE is not configured.", code="missing_auth_file", status=500
+        )
+
+    if not os.path.exists(auth_file):
+        emit_error(
+            f"Auth file does not exist: {auth_file}",
+            code="missing_auth_file",
+            status=400,
+        )
+
+    playlist_id = safe_str(payload.get("playlistId"))
+    if not playlist_id:
+        emit_error("playlistId is required.", code="invalid_input", status=400)
+
+    songs = payload.get("songs")
+    if not isinstance(songs, list) or not songs:
+        emit_error("songs must be a non-empty array.", code="invalid_input", status=400)
+    normalized_songs = cast(list[Any], songs)
+
+    try:
+        ytmusic = ytmusic_constructor(auth_file)
+    except Exception as exc:
+        emit_error(
+            "Failed to initialize ytmusicapi. Check your auth file.",
+            code="auth_init_failed",
+            status=400,
+            details=str(exc),
         )
 
+    debug_enabled = is_truthy(payload.get("debug")) or is_truthy(
+        os.environ.get("YTMUSIC_DEBUG")
+    )
+    preserve_position = is_truthy(payload.get("preservePosition"))
+
+    pending_migrations: list[dict[str, Any]] = []
+    failed: list[dict[str, Any]] = []
+    debug_searches: list[dict[str, Any]] = []
+
+    # Searches are independent network round-trips, so run them concurrently
+    # and collect the outcomes in input order; playlist edits stay serial.
+    # Query variants go to their own pool so song workers waiting on them can
+    # never starve it.
+    # Songs that normalize to the same title/artist/album are searched once;
+    # later occurrences reuse the first one's outcome.
+    match_keys = [song_match_key(song) for song in normalized_songs]
+    first_indices: dict[tuple[str, str, str], int] = {}
+    search_indices: list[int] = []
+    for index, match_key in enumerate(match_keys):
+        if match_key is not None:
+            if match_key in first_indices:
+                continue
+            first_indices[match_key] = index
+        search_indices.append(index)
+
+    searcher = CachedSearch(ytmusic, os.environ.get("YTMUSIC_SEARCH_CACHE", "").strip())
+    query_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS * 2)
+    try:
+        with query_executor, ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+            searched = dict(
+                zip(
+                    search_indices,
+                    executor.map(
+                        lambda index: search_song(
+                            searcher,
+                            index,
+                            normalized_songs[index],
+                            debug_enabled,
+                            query_executor,
+                        ),
+                        search_indices,
+                    ),
+                )
+            )
+    finally:
+        searcher.close()
+
+    for index, match_key in enumerate(match_keys):
+        if index in searched:
+            pending, failure, song_debug = searched[index]
+        else:
+            pending, failure, song_debug = reuse_outcome(
+                searched[first_indices[match_key]], index, normalized_songs[index]
+            )
+        debug_searches.extend(song_debug)
+        if failure is not None:
+            failed.append(failure)
+        elif pending is not None:
+            pending_migrations.append(pending)
+
     successful_migrations: list[dict[str, Any]] = []
 
     if pending_migrations:
@@ -455,170 +903,71 @@ def migrate_songs(payload: dict[str, Any]) -> dict[str, Any]:
                 )
                 successful_migrations = list(pending_migrations)
             else:
-                for song in pending_migrations:
-                    try:
-                        before_set_video_ids: set[str] = set()
-                        try:
-                            before_snapshot = ytmusic.get_playlist(
-                                playlist_id, limit=5000
-                            )
-                            before_tracks = (
-                                before_snapshot.get("tracks")
-                                if isinstance(before_snapshot, dict)
-                                else []
-                            )
-                            if isinstance(before_tracks, list):
-                                for track in before_tracks:
-                                    if isinstance(track, dict):
-                                        set_video_id = safe_str(track.get("setVideoId"))
-                                        if set_video_id:
-                                            before_set_video_ids.add(set_video_id)
-                        except Exception:
-                            before_set_video_ids = set()
+                before_set_video_ids: set[str] = set()
+                try:
+                    before_snapshot = ytmusic.get_playlist(playlist_id, limit=5000)
+                    before_set_video_ids = collect_set_video_ids(
+                        before_snapshot.get("tracks")
+                        if isinstance(before_snapshot, dict)
+                        else []
+                    )
+                except Exception:
+                    before_set_video_ids = set()
 
+                try:
+                    batch_added = add_succeeded(
                         ytmusic.add_playlist_items(
                             playlist_id,
-                            [song["videoId"]],
+                            [song["videoId"] for song in pending_migrations],
                             duplicates=False,
                         )
-
-                        successful_migrations.append(song)
-
-                        expected_index = safe_non_negative_int(
-                            song.get("expectedIndex")
-                        )
-                        if expected_index is None:
-                            continue
-
-                        # Best-effort repositioning: if this fails, keep the song as migrated
-                        # because it was already added to the playlist.
+                    )
+                except Exception:
+                    batch_added = False
+
+                added_video_ids: set[str] = set()
+                if batch_added:
+                    successful_migrations = list(pending_migrations)
+                    added_video_ids = {song["videoId"] for song in pending_migrations}
+                else:
+                    # Fall back to one add per song so a single rejected video
+                    # does not fail the whole batch.
+                    for song in pending_migrations:
                         try:
-                            inserted_set_video_id = ""
-                            inserted_index = -1
-                            fallback_set_video_id = ""
-                            fallback_index = -1
-
-                            after_tracks: list[Any] = []
-                            for attempt in range(5):
-                                after_snapshot = ytmusic.get_playlist(
-                                    playlist_id, limit=5000
-                                )
-                                candidate_tracks = (
-                                    after_snapshot.get("tracks")
-                                    if isinstance(after_snapshot, dict)
-                                    else []
+                            song_added = add_succeeded(
+                                ytmusic.add_playlist_items(
+                                    playlist_id,
+                                    [song["videoId"]],
+                                    duplicates=False,
                                 )
-                                after_tracks = (
-                                    candidate_tracks
-                                    if isinstance(candidate_tracks, list)
-                                    else []
-                                )
-                                if not after_tracks:
-                                    if attempt < 4:
-                                        time.sleep(0.25)
-                                    continue
-
-                                inserted_set_video_id = ""
-                                inserted_index = -1
-                                fallback_set_video_id = ""
-                                fallback_index = -1
-
-                                for track_index in range(len(after_tracks) - 1, -1, -1):
-                                    track = after_tracks[track_index]
-                                    if not isinstance(track, dict):
-                                        continue
-                                    track_video_id = safe_str(track.get("videoId"))
-                                    if track_video_id != song["videoId"]:
-                                        continue
-
-                                    track_set_video_id = safe_str(
-                                        track.get("setVideoId")
-                                    )
-                                    if (
-                                        track_set_video_id
-                                        and track_set_video_id
-                                        not in before_set_video_ids
-                                    ):
-                                        inserted_set_video_id = track_set_video_id
-                                        inserted_index = track_index
-                                        break
-
-                                    if track_set_video_id and not fallback_set_video_id:
-                                        fallback_set_video_id = track_set_video_id
-                                        fallback_index = track_index
-
-                                if inserted_set_video_id or fallback_set_video_id:
-                                    break
-                                if attempt < 4:
-                                    time.sleep(0.25)
-
-                            if not after_tracks:
-                                continue
-
-                            if not inserted_set_video_id and fallback_set_video_id:
-                                inserted_set_video_id = fallback_set_video_id
-                                inserted_index = fallback_index
-
-                            if not inserted_set_video_id:
-                                continue
-
-                            bounded_expected_index = min(
-                                expected_index, len(after_tracks) - 1
                             )
-                            if inserted_index == bounded_expected_index:
-                                continue
-
-                            successor_set_video_id = ""
-                            successor_index = bounded_expected_index
-                            if (
-                                inserted_index >= 0
-                                and inserted_index < bounded_expected_index
-                            ):
-                                successor_index = bounded_expected_index + 1
-
-                            if successor_index >= len(after_tracks):
-                                continue
-
-                            for candidate_index in range(
-                                successor_index, len(after_tracks)
-                            ):
-                                successor_track = after_tracks[candidate_index]
-                                if not isinstance(successor_track, dict):
-                                    continue
-
-                                candidate_set_video_id = safe_str(
-                                    successor_track.get("setVideoId")
-                                )
-                                if (
-                                    candidate_set_video_id
-                                    and candidate_set_video_id != inserted_set_video_id
-                                ):
-                                    successor_set_video_id = candidate_set_video_id
-                                    break
-
-                            if not successor_set_video_id:
-                                continue
-
-                            ytmusic.edit_playlist(
-                                playlist_id,
-                                moveItem=(
-                                    inserted_set_video_id,
-                                    successor_set_video_id,
-                                ),
+                        except Exception as exc:
+                            failed.append(
+                                {
+                                    "songKey": song.get("songKey"),
+                                    "title": song.get("title"),
+                                    "artist": song.get("artist"),
+                                    "album": song.get("album"),
+                                    "error": f"Failed to add song to playlist: {exc}",
+                                }
                             )
-                        except Exception:
                             continue
-                    except Exception as exc:
-                        failed.append(
-                            {
-                                "songKey": song.get("songKey"),
-                                "title": song.get("title"),
-                                "artist": song.get("artist"),
-                                "album": song.get("album"),
-                                "error": f"Failed to add song to playlist: {exc}",
-                            }
-                        )
-                        continue
+                        successful_migrations.append(song)
+                        if song_added:
+                            added_video_ids.add(song["videoId"])
+
+                # Best-effort repositioning: if this fails, keep the songs as
+                # migrated because they were already added to the playlist.
+                try:
+                    reposition_songs(
+                        ytmusic,
+                        playlist_id,
+                        successful_migrations,
+                        added_video_ids,
+                        before_set_video_ids,
+                    )
+                except Exception:
+                    pass
         except Exception as exc:
             failure_message = f"Failed to add songs to playlist: {exc}"
             for song in pending_migrations: